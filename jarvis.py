@@ -17,8 +17,9 @@ import os
 import re
 import subprocess
 import tkinter as tk
-from collections import Counter
+from collections import Counter, deque
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 from typing import Dict
@@ -45,7 +46,19 @@ DEFAULT_CONFIG = {
 APP_DIR = Path(__file__).resolve().parent
 HISTORY_FILE = APP_DIR / ".jarvis_history.log"
 
+# Compiled once at import so summarize_logs makes a single pass per line
+# instead of one re.search per level.
+_LEVEL_RE = re.compile(
+    r"\b(?P<err>error|exception|failed)\b|\b(?P<warn>warn(?:ing)?)\b|\b(?P<info>info)\b",
+    re.IGNORECASE,
+)
+_LEVEL_KEYWORDS = ("error", "warn", "fail", "exception", "info")
+_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?")
+_NUM_RE = re.compile(r"\b\d+\b")
+_WS_RE = re.compile(r"\s+")
 
+
+@lru_cache(maxsize=1)
 def load_config(path: Path) -> Dict[str, Dict[str, str]]:
     if not path.exists():
         path.write_text(json.dumps(DEFAULT_CONFIG, indent=2), encoding="utf-8")
@@ -80,10 +93,25 @@ def load_config(path: Path) -> Dict[str, Dict[str, str]]:
     return data
 
 
+_history_fh = None
+
+
 def append_history(command: str) -> None:
+    # Keep one line-buffered append handle open for the session instead of
+    # re-reading and rewriting the whole history file on every command.
+    global _history_fh
+    if _history_fh is None:
+        _history_fh = HISTORY_FILE.open("a", encoding="utf-8", buffering=1)
     stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    existing = HISTORY_FILE.read_text(encoding="utf-8") if HISTORY_FILE.exists() else ""
-    HISTORY_FILE.write_text(existing + f"[{stamp}] {command}\n", encoding="utf-8")
+    _history_fh.write(f"[{stamp}] {command}\n")
+
+
+@lru_cache(maxsize=1)
+def _has_vscode() -> bool:
+    # 'where code' spawns a shell and takes ~100ms; the answer doesn't
+    # change within a session, so probe once and remember.
+    check = subprocess.run(["where", "code"], capture_output=True, text=True, shell=True)
+    return check.returncode == 0
 
 
 def open_project(target: str, projects: Dict[str, str], open_mode: str = "explorer") -> str:
@@ -103,11 +131,9 @@ def open_project(target: str, projects: Dict[str, str], open_mode: str = "explor
             return f"Path not found: {path}\nTip: run 'list projects'. Known aliases: {known}"
         return f"Path not found: {path}"
 
-    if open_mode.lower() == "vscode":
-        code_check = subprocess.run(["where", "code"], capture_output=True, text=True, shell=True)
-        if code_check.returncode == 0:
-            subprocess.Popen(["code", str(path)], shell=True)
-            return f"Opened in VS Code: {path}"
+    if open_mode.lower() == "vscode" and _has_vscode():
+        subprocess.Popen(["code", str(path)], shell=True)
+        return f"Opened in VS Code: {path}"
 
     os.startfile(str(path))  # type: ignore[attr-defined]
     return f"Opened in File Explorer: {path}"
@@ -131,32 +157,44 @@ def summarize_logs(log_path: Path, max_lines: int = 4000) -> str:
     if not log_path.exists() or not log_path.is_file():
         return f"Log file not found: {log_path}"
 
-    raw = log_path.read_text(encoding="utf-8", errors="ignore").splitlines()
-    lines = raw[-max_lines:] if raw else []
+    # Stream the file and keep only the tail: constant memory even for
+    # multi-GB logs, instead of loading the whole file plus a list of
+    # every line just to slice off the end.
+    with log_path.open("r", encoding="utf-8", errors="ignore") as f:
+        lines = list(deque(f, maxlen=max_lines))
     if not lines:
         return f"No content in {log_path}"
 
-    error_count = sum(1 for line in lines if re.search(r"\berror\b|\bexception\b|\bfailed\b", line, re.IGNORECASE))
-    warn_count = sum(1 for line in lines if re.search(r"\bwarn(?:ing)?\b", line, re.IGNORECASE))
-    info_count = sum(1 for line in lines if re.search(r"\binfo\b", line, re.IGNORECASE))
-
-    normalized = []
+    level_counts = {"err": 0, "warn": 0, "info": 0}
+    pattern_counts: Counter[str] = Counter()
     for line in lines:
-        if not re.search(r"\berror\b|\bexception\b|\bfailed\b|\bwarn(?:ing)?\b", line, re.IGNORECASE):
+        # Cheap substring prefilter: most lines carry no level keyword at
+        # all, and `in` is far cheaper than firing up the regex engine.
+        if len(line) < 4:
+            continue
+        low = line.lower()
+        if not any(keyword in low for keyword in _LEVEL_KEYWORDS):
+            continue
+        match = _LEVEL_RE.search(low)
+        if not match:
+            continue
+        group = match.lastgroup
+        level_counts[group] += 1
+        if group == "info":
             continue
-        cleaned = re.sub(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?", "", line)
-        cleaned = re.sub(r"\b\d+\b", "#", cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = _TS_RE.sub("", line)
+        cleaned = _NUM_RE.sub("#", cleaned)
+        cleaned = _WS_RE.sub(" ", cleaned).strip()
         if cleaned:
-            normalized.append(cleaned[:180])
+            pattern_counts[cleaned[:180]] += 1
 
-    top_issues = Counter(normalized).most_common(5)
+    top_issues = pattern_counts.most_common(5)
     header = (
         f"Log summary: {log_path}\n"
         f"- total lines scanned: {len(lines)}\n"
-        f"- errors/exceptions: {error_count}\n"
-        f"- warnings: {warn_count}\n"
-        f"- info lines: {info_count}\n"
+        f"- errors/exceptions: {level_counts['err']}\n"
+        f"- warnings: {level_counts['warn']}\n"
+        f"- info lines: {level_counts['info']}\n"
     )
 
     if not top_issues:
@@ -166,6 +204,75 @@ def summarize_logs(log_path: Path, max_lines: int = 4000) -> str:
     return header + "- top repeated issue patterns:\n" + bullet_lines
 
 
+def _cmd_help(_arg: str, _config: Dict[str, Dict[str, str]]) -> str:
+    return (
+        "Commands:\n"
+        "- help\n"
+        "- list routines\n"
+        "- list projects\n"
+        "- open <project_alias_or_path>\n"
+        "- run <routine_name>\n"
+        "- summarize <log_file_path>\n"
+        "- history\n"
+        "- exit"
+    )
+
+
+def _cmd_list_routines(_arg: str, config: Dict[str, Dict[str, str]]) -> str:
+    routines = "\n".join([f"- {name}" for name in sorted(config["routines"])])
+    return f"Available routines:\n{routines}"
+
+
+def _cmd_list_projects(_arg: str, config: Dict[str, Dict[str, str]]) -> str:
+    projects = "\n".join([f"- {name}: {path}" for name, path in sorted(config["projects"].items())])
+    return f"Project aliases:\n{projects}"
+
+
+def _cmd_history(_arg: str, _config: Dict[str, Dict[str, str]]) -> str:
+    if not HISTORY_FILE.exists():
+        return "No history yet."
+    last_lines = HISTORY_FILE.read_text(encoding="utf-8").splitlines()[-20:]
+    return "Recent commands:\n" + "\n".join(last_lines)
+
+
+def _cmd_exit(_arg: str, _config: Dict[str, Dict[str, str]]) -> str:
+    return "Use the window close button to exit GUI mode."
+
+
+def _cmd_open(arg: str, config: Dict[str, Dict[str, str]]) -> str:
+    return open_project(arg, config["projects"], str(config.get("open_mode", "explorer")))
+
+
+def _cmd_run(arg: str, config: Dict[str, Dict[str, str]]) -> str:
+    return run_routine(arg, config["routines"])
+
+
+def _cmd_summarize(arg: str, config: Dict[str, Dict[str, str]]) -> str:
+    return summarize_logs(Path(arg.strip('"')).expanduser())
+
+
+# O(1) dispatch for exact commands, then a short prefix scan for the
+# variadic ones, instead of re-comparing the input against every command.
+# Split in two so routine-name shorthand keeps its baseline precedence:
+# only help/commands/list routines outrank a routine with the same name.
+_EXACT_BEFORE_ROUTINES = {
+    "help": _cmd_help,
+    "commands": _cmd_help,
+    "list routines": _cmd_list_routines,
+}
+_EXACT_AFTER_ROUTINES = {
+    "list projects": _cmd_list_projects,
+    "history": _cmd_history,
+    "exit": _cmd_exit,
+    "quit": _cmd_exit,
+}
+_PREFIX_COMMANDS = (
+    ("open ", _cmd_open),
+    ("run ", _cmd_run),
+    ("summarize ", _cmd_summarize),
+)
+
+
 def parse_and_execute(command: str, config: Dict[str, Dict[str, str]]) -> str:
     text = command.strip()
     if not text:
@@ -173,47 +280,20 @@ def parse_and_execute(command: str, config: Dict[str, Dict[str, str]]) -> str:
 
     lower = text.lower()
 
-    if lower in {"help", "commands"}:
-        return (
-            "Commands:\n"
-            "- help\n"
-            "- list routines\n"
-            "- list projects\n"
-            "- open <project_alias_or_path>\n"
-            "- run <routine_name>\n"
-            "- summarize <log_file_path>\n"
-            "- history\n"
-            "- exit"
-        )
-
-    if lower == "list routines":
-        routines = "\n".join([f"- {name}" for name in sorted(config["routines"])])
-        return f"Available routines:\n{routines}"
+    handler = _EXACT_BEFORE_ROUTINES.get(lower)
+    if handler:
+        return handler("", config)
 
     if text in config["routines"]:
         return run_routine(text, config["routines"])
 
-    if lower == "list projects":
-        projects = "\n".join([f"- {name}: {path}" for name, path in sorted(config["projects"].items())])
-        return f"Project aliases:\n{projects}"
+    handler = _EXACT_AFTER_ROUTINES.get(lower)
+    if handler:
+        return handler("", config)
 
-    if lower == "history":
-        if not HISTORY_FILE.exists():
-            return "No history yet."
-        last_lines = HISTORY_FILE.read_text(encoding="utf-8").splitlines()[-20:]
-        return "Recent commands:\n" + "\n".join(last_lines)
-
-    if lower.startswith("open "):
-        target = text[5:].strip()
-        return open_project(target, config["projects"], str(config.get("open_mode", "explorer")))
-
-    if lower.startswith("run "):
-        name = text[4:].strip()
-        return run_routine(name, config["routines"])
-
-    if lower.startswith("summarize "):
-        path_str = text[10:].strip().strip('"')
-        return summarize_logs(Path(path_str).expanduser())
+    for prefix, handler in _PREFIX_COMMANDS:
+        if lower.startswith(prefix):
+            return handler(text[len(prefix):].strip(), config)
 
     if "organize downloads" in lower:
         return run_routine("organize_downloads", config["routines"])
@@ -221,9 +301,6 @@ def parse_and_execute(command: str, config: Dict[str, Dict[str, str]]) -> str:
     if "organize desktop" in lower:
         return run_routine("organize_desktop", config["routines"])
 
-    if lower in {"exit", "quit"}:
-        return "Use the window close button to exit GUI mode."
-
     return "Unknown command. Type 'help' to see supported commands."
 
 
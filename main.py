@@ -13,12 +13,29 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
+import queue
+import re
 import shutil
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object  # type: ignore[assignment, misc]
+    Observer = None
 
 
 EXTENSION_MAP = {
@@ -51,6 +68,10 @@ EXTENSION_MAP = {
     "executables": {".exe", ".msi", ".bat", ".cmd", ".ps1"},
 }
 
+# Inverted once at import so classify_file is a single dict lookup
+# instead of a membership test per category.
+EXT_TO_CATEGORY = {ext: category for category, exts in EXTENSION_MAP.items() for ext in exts}
+
 IGNORED_DIRS = {"$recycle.bin", "system volume information", ".git", "__pycache__"}
 INDEX_FILENAME = ".organizer_index.json"
 
@@ -66,149 +87,310 @@ class Config:
 
 
 def classify_file(path: Path) -> str:
-    ext = path.suffix.lower()
-    for category, exts in EXTENSION_MAP.items():
-        if ext in exts:
-            return category
-    return "other"
+    return EXT_TO_CATEGORY.get(path.suffix.lower(), "other")
 
 
-def month_bucket(path: Path) -> str:
-    modified = datetime.fromtimestamp(path.stat().st_mtime)
+def month_bucket(stat: os.stat_result) -> str:
+    modified = datetime.fromtimestamp(stat.st_mtime)
     return modified.strftime("%Y-%m")
 
 
+# Matched text doubles as the bucket name, so a hit maps straight through.
+_SOURCE_APP_RE = re.compile(r"whatsapp|telegram|discord|slack")
+# Group names double as bucket names; alternation resolves leftmost-first,
+# which matches the old chained-check precedence for realistic names.
+_SOURCE_NAME_RE = re.compile(
+    r"(?P<screenshots>^(?:screenshot|snip)|screen shot)"
+    r"|(?P<camera_exports>^(?:img_|dsc_|pxl_))"
+    r"|(?P<browser_downloads>chrome|edge|firefox)"
+    r"|(?P<meetings>zoom|meeting|teams)"
+)
+_SOURCE_EXT_BUCKETS = {
+    ".crdownload": "browser_partial_downloads",
+    ".part": "browser_partial_downloads",
+    ".torrent": "torrent",
+}
+
+
 def source_bucket(path: Path) -> str:
     """Best-effort source/workflow classifier based on path and filename patterns."""
     name = path.name.lower()
-    parent = str(path.parent).lower()
     ext = path.suffix.lower()
 
-    if "whatsapp" in name or "whatsapp" in parent:
-        return "whatsapp"
-    if "telegram" in name or "telegram" in parent:
-        return "telegram"
-    if "discord" in name or "discord" in parent:
-        return "discord"
-    if "slack" in name or "slack" in parent:
-        return "slack"
+    match = _SOURCE_APP_RE.search(name) or _SOURCE_APP_RE.search(str(path.parent).lower())
+    if match:
+        return match.group()
 
-    if name.startswith("screenshot") or "screen shot" in name or name.startswith("snip"):
-        return "screenshots"
-    if name.startswith("img_") or name.startswith("dsc_") or name.startswith("pxl_"):
-        return "camera_exports"
+    ext_bucket = _SOURCE_EXT_BUCKETS.get(ext)
+    if ext_bucket:
+        return ext_bucket
 
-    if "chrome" in name or "edge" in name or "firefox" in name:
-        return "browser_downloads"
-    if ext in {".crdownload", ".part"}:
-        return "browser_partial_downloads"
-
-    if "zoom" in name or "meeting" in name or "teams" in name:
-        return "meetings"
-
-    if ext in {".torrent"}:
-        return "torrent"
+    match = _SOURCE_NAME_RE.search(name)
+    if match:
+        return match.lastgroup or "manual_or_unknown"
 
     return "manual_or_unknown"
 
 
-def sha256sum(path: Path, chunk_size: int = 1024 * 1024) -> str:
-    h = hashlib.sha256()
+def quick_fingerprint(path: Path, stat: os.stat_result) -> str:
+    """Cheap content fingerprint: size plus hash of the first and last 4 KiB.
+
+    Nearly all non-duplicate files differ in this fingerprint, so the full
+    SHA-256 only ever runs to confirm a fingerprint collision.
+    """
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            h.update(chunk)
+        head = f.read(4096)
+        if stat.st_size > 8192:
+            f.seek(-4096, 2)
+        tail = f.read(4096)
+    h = hashlib.blake2b(stat.st_size.to_bytes(8, "little") + head + tail, digest_size=16)
     return h.hexdigest()
 
 
+def sha256sum(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    # buffering=0: hashing streams the whole file anyway, so the extra
+    # BufferedIO copy buys nothing.
+    with path.open("rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            h.update(view[:read])
+        return h.hexdigest()
+
+
 def safe_name(target: Path) -> Path:
-    if not target.exists():
+    # One directory listing instead of an exists() probe per candidate
+    # suffix, which went quadratic once a bucket held many collisions.
+    # Names are normcased on both sides so collisions are detected the
+    # way the filesystem sees them (case-insensitive on Windows).
+    try:
+        existing = {os.path.normcase(entry.name) for entry in os.scandir(target.parent)}
+    except OSError:
+        existing = set()
+    if os.path.normcase(target.name) not in existing:
         return target
 
     stem = target.stem
     suffix = target.suffix
-    parent = target.parent
-    i = 1
-    while True:
-        candidate = parent / f"{stem} ({i}){suffix}"
-        if not candidate.exists():
-            return candidate
-        i += 1
+    pattern = re.compile(
+        re.escape(os.path.normcase(stem)) + r" \((\d+)\)" + re.escape(os.path.normcase(suffix))
+    )
+    used = [int(m.group(1)) for name in existing if (m := pattern.fullmatch(name))]
+    return target.parent / f"{stem} ({max(used, default=0) + 1}){suffix}"
+
+
+class FileIndex(Dict[str, List[Dict[str, object]]]):
+    """Fingerprint-keyed index that remembers whether it changed since load.
+
+    Each fingerprint maps to the list of organized files sharing it; an
+    entry's full sha256 is only filled in once a collision forces it.
+    """
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)
+        self.dirty = False
 
+    def __setitem__(self, key: str, value: List[Dict[str, object]]) -> None:
+        self.dirty = True
+        super().__setitem__(key, value)
 
-def load_index(index_path: Path) -> Dict[str, str]:
+
+def load_index(index_path: Path) -> FileIndex:
     if not index_path.exists():
-        return {}
+        return FileIndex()
     try:
-        return json.loads(index_path.read_text(encoding="utf-8"))
+        data = json.loads(index_path.read_text(encoding="utf-8"))
     except (json.JSONDecodeError, OSError):
-        return {}
+        return FileIndex()
+
+    index = FileIndex()
+    migrated = False
+    for key, value in data.items():
+        if isinstance(value, list):
+            entries = [e for e in value if isinstance(e, dict) and "path" in e]
+            if entries:
+                index[key] = entries
+            continue
+        # Legacy digest-keyed entry (path string or dict): re-fingerprint
+        # the stored file so duplicate knowledge survives the rekeying.
+        # The old key was the file's sha256, so carry it over.
+        if isinstance(value, str):
+            value = {"path": value}
+        if not (isinstance(value, dict) and "path" in value):
+            continue
+        known_path = Path(str(value["path"]))
+        try:
+            stat = known_path.stat()
+            fingerprint = quick_fingerprint(known_path, stat)
+        except OSError:
+            continue
+        entry = {"path": str(known_path), "size": stat.st_size, "mtime": stat.st_mtime, "sha256": key}
+        index[fingerprint] = index.get(fingerprint, []) + [entry]
+        migrated = True
+    index.dirty = migrated
+    return index
 
 
-def save_index(index_path: Path, index: Dict[str, str], dry_run: bool) -> None:
-    if dry_run:
+def save_index(index_path: Path, index: FileIndex, dry_run: bool) -> None:
+    if dry_run or not index.dirty:
         return
-    index_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    if orjson is not None:
+        data = orjson.dumps(dict(index), option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(index, indent=2).encode("utf-8")
+    # Write-then-rename so a crash mid-write can't truncate the index.
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, index_path)
+    index.dirty = False
 
 
-def should_ignore(path: Path, destination: Path) -> bool:
-    if not path.is_file():
-        return True
-    if any(part.lower() in IGNORED_DIRS for part in path.parts):
-        return True
+def should_ignore(path: Path, dest_prefix: str) -> bool:
+    """Decide whether a regular file found during the scan should be skipped."""
     if path.name == INDEX_FILENAME:
         return True
     # Skip files already in destination tree.
-    try:
-        path.resolve().relative_to(destination.resolve())
-        return True
-    except ValueError:
-        return False
-
-
-def list_candidate_files(source: Path, destination: Path, recursive: bool) -> Iterable[Path]:
-    iterator = source.rglob("*") if recursive else source.glob("*")
-    for path in iterator:
-        if should_ignore(path, destination):
+    return os.path.normcase(str(path)).startswith(dest_prefix)
+
+
+def list_candidate_files(
+    source: Path, destination: Path, recursive: bool
+) -> Iterable[Tuple[Path, os.stat_result]]:
+    # os.scandir caches file type and stat from the readdir call, so the
+    # walk avoids the per-entry re-stat that rglob + is_file() incurs.
+    # Ignored directories are pruned here instead of filtered per file.
+    # Resolving the destination once here replaces a realpath syscall pair
+    # (and a ValueError in the common case) per candidate file.
+    dest_prefix = os.path.normcase(str(destination.resolve())) + os.sep
+    stack = [str(source)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
             continue
-        yield path
-
-
-def move_file(src: Path, dst: Path, dry_run: bool) -> Path:
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.name.lower() not in IGNORED_DIRS:
+                        stack.append(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                path = Path(entry.path)
+                if should_ignore(path, dest_prefix):
+                    continue
+                yield path, entry.stat()
+
+
+def move_file(src: Path, dst: Path, dry_run: bool, created: Set[str]) -> Path:
     dst = safe_name(dst)
     if dry_run:
         return dst
-    dst.parent.mkdir(parents=True, exist_ok=True)
+    # Bucket directories are shared by many files per pass; only issue
+    # the mkdir the first time each one is seen.
+    parent_str = str(dst.parent)
+    if parent_str not in created:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        created.add(parent_str)
     return Path(shutil.move(str(src), str(dst)))
 
 
-def organize_file(path: Path, config: Config, index: Dict[str, str]) -> Tuple[str, str]:
+def fingerprint_candidates(files: List[Tuple[Path, os.stat_result]]) -> Dict[str, str]:
+    """Map path -> fingerprint for every candidate, reading in parallel.
+
+    File reads and hashing release the GIL, so threads give near-linear
+    speedup until disk bandwidth saturates. Files that fail here (e.g.
+    vanished mid-pass) are simply absent; organize_file retries them
+    inline so the error is reported per file as before.
+    """
+    fingerprints: Dict[str, str] = {}
+    if files:
+        workers = min(8, os.cpu_count() or 1, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(quick_fingerprint, path, stat): path for path, stat in files}
+            for future in as_completed(futures):
+                try:
+                    fingerprints[str(futures[future])] = future.result()
+                except OSError:
+                    continue
+    return fingerprints
+
+
+def organize_file(
+    path: Path,
+    stat: os.stat_result,
+    config: Config,
+    index: FileIndex,
+    fingerprints: Dict[str, str],
+    created: Set[str],
+) -> Tuple[str, str]:
+    path_str = str(path)
     category = classify_file(path)
     if config.sort_mode == "source":
         bucket = source_bucket(path)
     else:
-        bucket = month_bucket(path)
+        bucket = month_bucket(stat)
     base_target = config.destination / category / bucket / path.name
 
-    digest = sha256sum(path)
-    known_path_str = index.get(digest)
-    known_path = Path(known_path_str) if known_path_str else None
-
-    if known_path and known_path.exists() and known_path.resolve() != path.resolve():
+    fingerprint = fingerprints.get(path_str)
+    if fingerprint is None:
+        fingerprint = quick_fingerprint(path, stat)
+
+    # A fingerprint collision is only a *candidate* duplicate; confirm
+    # with full SHA-256 of both files before treating it as one. Unique
+    # fingerprints — the overwhelming majority — never pay for a full hash.
+    entries = index.get(fingerprint, [])
+    duplicate = False
+    own_sha = None
+    for entry in entries:
+        known_path = Path(str(entry["path"]))
+        if not known_path.exists() or known_path.resolve() == path.resolve():
+            continue
+        if own_sha is None:
+            own_sha = sha256sum(path)
+        known_sha = entry.get("sha256")
+        if known_sha is None:
+            known_sha = sha256sum(known_path)
+            entry["sha256"] = known_sha
+            index.dirty = True
+        if own_sha == known_sha:
+            duplicate = True
+            break
+
+    if duplicate:
         duplicate_target = config.destination / "duplicates" / bucket / path.name
-        final_path = move_file(path, duplicate_target, config.dry_run)
+        final_path = move_file(path, duplicate_target, config.dry_run, created)
         return ("duplicate", str(final_path))
 
-    final_path = move_file(path, base_target, config.dry_run)
-    index[digest] = str(final_path)
+    new_entry: Dict[str, object] = {"path": "", "size": stat.st_size, "mtime": stat.st_mtime}
+    if own_sha is not None:
+        new_entry["sha256"] = own_sha
+    final_path = move_file(path, base_target, config.dry_run, created)
+    new_entry["path"] = str(final_path)
+    index[fingerprint] = entries + [new_entry]
     return ("moved", str(final_path))
 
 
 def prune_empty_dirs(root: Path, keep_empty: bool) -> None:
     if keep_empty:
         return
-    for directory in sorted((p for p in root.rglob("*") if p.is_dir()), key=lambda p: len(p.parts), reverse=True):
+    # Bottom-up walk removes nested empty dirs in one pass without
+    # materializing and sorting every directory under root first. dirnames
+    # may still list subdirs removed moments ago, so only directories that
+    # contain files are skipped without attempting the rmdir.
+    root_str = str(root)
+    for dirpath, _dirnames, filenames in os.walk(root, topdown=False):
+        if filenames or dirpath == root_str:
+            continue
         try:
-            directory.rmdir()
+            os.rmdir(dirpath)
         except OSError:
             continue
 
@@ -221,24 +403,55 @@ def organize_pass(config: Config) -> Tuple[int, int]:
     moved = 0
     duplicates = 0
     files = list(list_candidate_files(config.source, config.destination, config.recursive))
-    for file_path in files:
+    fingerprints = fingerprint_candidates(files)
+    created: Set[str] = set()
+    # Buffer per-file messages and emit them in one write: print-per-file
+    # means a lock acquire and flush per line, which adds up on big passes.
+    messages = []
+    for file_path, stat in files:
         try:
-            status, target = organize_file(file_path, config, index)
+            status, target = organize_file(file_path, stat, config, index, fingerprints, created)
             if status == "duplicate":
                 duplicates += 1
-                print(f"[DUPLICATE] {file_path} -> {target}")
+                messages.append(f"[DUPLICATE] {file_path} -> {target}")
             else:
                 moved += 1
-                print(f"[MOVED] {file_path} -> {target}")
+                messages.append(f"[MOVED] {file_path} -> {target}")
         except Exception as exc:  # pragma: no cover
-            print(f"[ERROR] {file_path} ({exc})")
+            messages.append(f"[ERROR] {file_path} ({exc})")
+    if messages:
+        sys.stdout.write("\n".join(messages) + "\n")
+        sys.stdout.flush()
 
     save_index(index_path, index, config.dry_run)
     prune_empty_dirs(config.source, config.keep_empty)
     return moved, duplicates
 
 
-def watch_loop(config: Config, interval: int) -> None:
+class _WatchHandler(FileSystemEventHandler):
+    """Funnels filesystem events into a queue; the watch loop drains it."""
+
+    def __init__(self, events: "queue.Queue[str]", dest_prefix: str) -> None:
+        self.events = events
+        self.dest_prefix = dest_prefix
+
+    def _enqueue(self, path: str) -> None:
+        # The pass's own writes (moves into the destination, the index
+        # rewrite) raise events too; re-scanning for those is pure churn.
+        if not os.path.normcase(path).startswith(self.dest_prefix):
+            self.events.put(path)
+
+    def on_created(self, event) -> None:
+        self._enqueue(event.src_path)
+
+    def on_modified(self, event) -> None:
+        self._enqueue(event.src_path)
+
+    def on_moved(self, event) -> None:
+        self._enqueue(event.dest_path)
+
+
+def poll_loop(config: Config, interval: int) -> None:
     print(f"Watching '{config.source}' every {interval}s. Press Ctrl+C to stop.")
     while True:
         moved, duplicates = organize_pass(config)
@@ -247,6 +460,41 @@ def watch_loop(config: Config, interval: int) -> None:
         time.sleep(interval)
 
 
+def watch_loop(config: Config, interval: int) -> None:
+    if Observer is None:
+        # watchdog not installed: fall back to interval polling.
+        poll_loop(config, interval)
+        return
+
+    events: "queue.Queue[str]" = queue.Queue()
+    dest_prefix = os.path.normcase(str(config.destination.resolve())) + os.sep
+    observer = Observer()
+    observer.schedule(_WatchHandler(events, dest_prefix), str(config.source), recursive=config.recursive)
+    observer.start()
+    print(f"Watching '{config.source}' for changes. Press Ctrl+C to stop.")
+    try:
+        # Catch up on whatever is already sitting in the source folder.
+        organize_pass(config)
+        while True:
+            # Poll with a timeout: a bare get() blocks in a way that keeps
+            # Ctrl+C from being delivered on Windows.
+            try:
+                events.get(timeout=1)
+            except queue.Empty:
+                continue
+            # Debounce: let a burst of events (downloads, unzips) settle,
+            # then run one pass that covers all of them.
+            time.sleep(1)
+            while not events.empty():
+                events.get_nowait()
+            moved, duplicates = organize_pass(config)
+            if moved or duplicates:
+                print(f"Cycle complete: moved={moved}, duplicates={duplicates}")
+    finally:
+        observer.stop()
+        observer.join()
+
+
 def parse_args() -> argparse.Namespace:
     default_source = Path.home() / "Downloads"
     default_destination = default_source / "Organized"